@@ -2,26 +2,26 @@ import xbmcgui
 import xbmcplugin
 import xbmc
 import xbmcvfs
-import shutil
-import zipfile
 import time
 import os
+import re
 import sys
-import urllib.request
 import urllib.parse
-import json
-from pathlib import Path
+from collections import deque
 
 # Import constants and paths
 from constants import (
-    ADDON, ADDON_ID, HOME, ADDONS, USERDATA, TEMP, THUMBNAILS, 
-    PACKAGES, LOGPATH, MEDIA, DATABASE, DESCRIPTIONS
+    ADDON_ID, HOME, ADDONS, USERDATA, TEMP, THUMBNAILS, 
+    PACKAGES, LOGPATH, MEDIA, DATABASE, get_addon
 )
+from descriptions import DESCRIPTIONS
+from cleaner import notify, log_error, safe_wipe_folder, clear_folder
 
-# --- Helper Functions ---
+# Platform checks cross into Kodi, so evaluate them once per run
+IS_WINDOWS = xbmc.getCondVisibility('system.platform.windows')
+IS_ANDROID = xbmc.getCondVisibility('system.platform.android')
 
-def notify(title, message, duration=5000):
-    xbmcgui.Dialog().notification(title, message, time=duration)
+# --- Helper Functions ---
 
 def confirm_action(title, message):
     return xbmcgui.Dialog().yesno(title, message)
@@ -29,45 +29,94 @@ def confirm_action(title, message):
 def show_description(title, description):
     xbmcgui.Dialog().ok(title, description)
 
-def log_error(context, exception):
-    """Centralized error handling."""
-    msg = f"LazyMaintenance Error [{context}]: {str(exception)}"
-    xbmc.log(msg, xbmc.LOGERROR)
-    if not context.startswith("Auto"):
-        notify('Lazy Maintenance Error', f'{context}: {str(exception)}')
-
 def get_zip_arcname(full_path, base_path):
-    try:
-        relative_path = full_path.relative_to(base_path)
-        return str(relative_path).replace(os.sep, '/')
-    except ValueError:
-        return str(full_path.name)
-
-def get_folder_size(path_obj):
-    total = 0
-    if not path_obj.exists():
-        return 0
-    for root, dirs, files in os.walk(str(path_obj)):
-        for f in files:
-            fp = os.path.join(root, f)
-            try:
-                total += os.path.getsize(fp)
-            except OSError:
-                pass
-    return total
+    prefix = os.path.join(base_path, '')
+    if full_path.startswith(prefix):
+        return full_path[len(prefix):].replace(os.sep, '/')
+    return os.path.basename(full_path)
 
-CHUNK_SIZE = 8 * 1024 * 1024  # 8MB
+def deflate_file(path):
+    """
+    Reads a file and compresses it to a raw DEFLATE stream for the zip.
+    Runs on a worker thread - zlib releases the GIL while compressing.
+    """
+    import zlib
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    compressor = zlib.compressobj(ZIP_COMPRESSLEVEL, zlib.DEFLATED, -15)
+    payload = compressor.compress(data) + compressor.flush()
+    return zlib.crc32(data), len(data), payload
+
+def write_precompressed(zipf, zinfo, crc, file_size, payload):
+    """
+    Appends an entry whose payload came from deflate_file().
+    zipfile has no public raw-write API, so this follows the same steps
+    ZipFile.write() takes for directory entries.
+    """
+    import zipfile
+
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.CRC = crc
+    zinfo.file_size = file_size
+    zinfo.compress_size = len(payload)
+    zipf.fp.seek(zipf.start_dir)
+    zinfo.header_offset = zipf.fp.tell()
+    zipf._writecheck(zinfo)
+    zipf._didModify = True
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+    zipf.fp.write(zinfo.FileHeader(False))
+    zipf.fp.write(payload)
+    zipf.start_dir = zipf.fp.tell()
+
+def get_chunk_size():
+    """VFS transfer chunk size in bytes from the vfs_chunk_kb setting, 4MB by default."""
+    try:
+        chunk_kb = int(get_addon().getSetting('vfs_chunk_kb'))
+    except (ValueError, TypeError):
+        chunk_kb = 4096
+    return max(chunk_kb, 64) * 1024
+
+COPY_BUFFER_SIZE = 256 * 1024  # Per-file copy buffer for zip streaming
+ZIP_COMPRESSLEVEL = 1  # zlib level 1 is several times faster than 6 for a few % size
+# Already-compressed formats gain nothing from DEFLATE, so they are stored as-is
+STORED_EXTS = frozenset({
+    '.jpg', '.jpeg', '.png', '.webp', '.gif', '.mp4', '.mkv', '.mp3',
+    '.flac', '.ogg', '.zip', '.7z', '.gz', '.xz',
+})
+# Directory names skipped at any depth while backing up each root
+BACKUP_EXCLUDE_DIRS = frozenset({'.git', '__pycache__'})
+USERDATA_EXCLUDE_DIRS = BACKUP_EXCLUDE_DIRS | {'Thumbnails'}
+ADDONS_EXCLUDE_DIRS = BACKUP_EXCLUDE_DIRS | {'packages', 'temp'}
+TEXTURES_DB_RE = re.compile(r'(?i)^textures.*\.db$')
+DEFLATE_WORKERS = os.cpu_count() or 2  # Backup compression threads
+PARALLEL_DEFLATE_MAX = 1024 * 1024  # Larger files are streamed instead of compressed in RAM
+LOG_TAIL_SIZE = 512 * 1024  # Read Log shows only this much of the end of kodi.log
+
+def is_vfs_url(path):
+    """True for VFS URLs (smb://, nfs://, ftp://, special://...) that plain open() can't address."""
+    return '://' in path
 
 def vfs_copy_file(source_local_path, dest_vfs_path):
     """Copy a local file to any VFS destination (SMB/FTP/local) in chunks."""
+    import shutil
+
     try:
+        if not is_vfs_url(dest_vfs_path):
+            # Local destination: let the OS do the copy (sendfile/CopyFileW)
+            shutil.copyfile(source_local_path, dest_vfs_path)
+            return True
         vfs_file = xbmcvfs.File(dest_vfs_path, 'w')
-        with open(str(source_local_path), 'rb') as src:
+        # Reuse one buffer instead of converting every chunk to a new bytearray
+        chunk_size = get_chunk_size()
+        buf = bytearray(chunk_size)
+        with open(source_local_path, 'rb', buffering=0) as src:
             while True:
-                chunk = src.read(CHUNK_SIZE)
-                if not chunk:
+                n = src.readinto(buf)
+                if not n:
                     break
-                vfs_file.write(bytearray(chunk))
+                vfs_file.write(buf if n == chunk_size else buf[:n])
         vfs_file.close()
         return True
     except Exception as e:
@@ -76,11 +125,17 @@ def vfs_copy_file(source_local_path, dest_vfs_path):
 
 def vfs_download_file(source_vfs_path, dest_local_path):
     """Download a VFS file (SMB/FTP/etc) to a local path in chunks."""
+    import shutil
+
     try:
+        if not is_vfs_url(source_vfs_path):
+            shutil.copyfile(source_vfs_path, dest_local_path)
+            return True
         vfs_file = xbmcvfs.File(source_vfs_path, 'r')
-        with open(str(dest_local_path), 'wb') as dst:
+        chunk_size = get_chunk_size()
+        with open(dest_local_path, 'wb') as dst:
             while True:
-                chunk = vfs_file.readBytes(CHUNK_SIZE)
+                chunk = vfs_file.readBytes(chunk_size)
                 if not chunk:
                     break
                 dst.write(chunk)
@@ -102,11 +157,11 @@ def force_close_kodi():
     xbmc.log("LazyMaintenance: Initiating Force Close sequence...", xbmc.LOGINFO)
 
     try:
-        if xbmc.getCondVisibility('system.platform.windows'):
+        if IS_WINDOWS:
             # Windows needs explicit taskkill - os._exit alone is less reliable here
             os.system('taskkill /F /IM kodi.exe /T')
 
-        elif xbmc.getCondVisibility('system.platform.android'):
+        elif IS_ANDROID:
             # Android: try am force-stop as best effort, os._exit handles the rest
             os.system('am force-stop org.xbmc.kodi 2>/dev/null; '
                       'am force-stop tv.kodi.kodi 2>/dev/null; '
@@ -126,83 +181,6 @@ def force_close_kodi():
     # down with it on all platforms including Android and Flatpak
     os._exit(1)
 
-def safe_delete_item(item_path):
-    """
-    Tries to delete a file or folder. 
-    If locked (Windows/Kodi in use), it skips it without crashing.
-    """
-    try:
-        if item_path.is_dir():
-            shutil.rmtree(str(item_path), ignore_errors=True)
-        else:
-            item_path.unlink()
-    except Exception:
-        # File is likely locked by the OS, skip it
-        xbmc.log(f"LazyMaintenance: Skipped locked file {item_path.name}", xbmc.LOGDEBUG)
-        pass
-
-def safe_wipe_folder(folder_path, exclude_list=None):
-    """
-    Iterates through a folder and deletes items one by one.
-    This ensures that one locked file doesn't stop the whole process.
-    """
-    if exclude_list is None:
-        exclude_list = []
-    if not folder_path.exists(): return
-    
-    for item in folder_path.iterdir():
-        if item.name in exclude_list: continue
-        safe_delete_item(item)
-
-# --- Core Logic ---
-
-def trim_folder(path_obj, max_size_mb):
-    """Trims folder to target size in MB."""
-    if not path_obj.exists():
-        return
-
-    max_size_bytes = max_size_mb * 1024 * 1024
-    current_size = get_folder_size(path_obj)
-    
-    if current_size <= max_size_bytes:
-        return
-
-    file_list = []
-    for root, dirs, found_files in os.walk(str(path_obj)):
-        for f in found_files:
-            if f == 'kodi.log': continue
-            fp = Path(root) / f
-            try:
-                stat = fp.stat()
-                file_list.append((stat.st_mtime, stat.st_size, fp))
-            except Exception as e:
-                xbmc.log(f"Error reading file stats {fp}: {e}", xbmc.LOGDEBUG)
-
-    file_list.sort(key=lambda x: x[0])
-
-    for mtime, size, fp in file_list:
-        try:
-            fp.unlink()
-            current_size -= size
-            if current_size <= max_size_bytes:
-                break
-        except Exception:
-            pass
-
-    for root, dirs, files in os.walk(str(path_obj), topdown=False):
-        for d in dirs:
-            dp = Path(root) / d
-            try:
-                if not any(dp.iterdir()):
-                    dp.rmdir()
-            except Exception:
-                pass
-
-def clear_folder(path_obj):
-    if not path_obj.exists(): return
-    # Use the robust safe wipe function
-    safe_wipe_folder(path_obj, exclude_list=['kodi.log'])
-
 # --- Actions ---
 
 def hard_clean():
@@ -229,11 +207,11 @@ def hard_clean():
         clear_folder(THUMBNAILS)
 
         progress.update(80, 'Deleting Textures13.db...')
-        textures_db = DATABASE / 'Textures13.db'
-        if textures_db.exists():
+        textures_db = os.path.join(DATABASE, 'Textures13.db')
+        if os.path.exists(textures_db):
             # Wrapped in try-except so Windows doesn't crash if locked
             try:
-                textures_db.unlink()
+                os.unlink(textures_db)
             except Exception:
                 xbmc.log("LazyMaintenance: Textures13.db is locked. Skipping.", xbmc.LOGINFO)
 
@@ -249,29 +227,11 @@ def hard_clean():
         if 'progress' in locals(): progress.close()
         log_error('Hard Clean', e)
 
-def clean(silent=False):
-    """Auto clean on startup"""
-    try:
-        try:
-            auto_limit = int(ADDON.getSetting('auto_clean_size'))
-        except (ValueError, TypeError):
-            auto_limit = 50
-
-        clear_folder(TEMP)
-        clear_folder(PACKAGES)
-        if auto_limit > 0:
-            trim_folder(THUMBNAILS, auto_limit)
-
-        if silent:
-            msg = 'Auto clean done.'
-        else:
-            msg = 'Cleaning completed.'
-        notify('Lazy Maintenance', msg)
-
-    except Exception as e:
-        log_error('Auto Cleaning', e)
-
 def backup():
+    import shutil
+    import zipfile
+    from concurrent.futures import ThreadPoolExecutor
+
     show_description('Backup', DESCRIPTIONS['Backup'])
     
     while True:
@@ -304,59 +264,112 @@ def backup():
         progress = xbmcgui.DialogProgress()
         progress.create('Backup', 'Calculating files...')
         
-        def _count_backup_files(folder_path, exclude_db=False):
-            """Count files respecting the same exclusions as add_folder_to_zip."""
-            count = 0
-            for root, dirs, files_list in os.walk(str(folder_path)):
-                if folder_path == USERDATA and 'Thumbnails' in dirs: dirs.remove('Thumbnails')
-                if folder_path == ADDONS and 'packages' in dirs: dirs.remove('packages')
-                if folder_path == ADDONS and 'temp' in dirs: dirs.remove('temp')
-                if '.git' in dirs: dirs.remove('.git')
-                if '__pycache__' in dirs: dirs.remove('__pycache__')
-                for f in files_list:
-                    if exclude_db and f.lower().startswith('textures') and f.lower().endswith('.db'):
-                        continue
-                    count += 1
-            return count
-
-        total_items = _count_backup_files(ADDONS) + \
-                      _count_backup_files(USERDATA, exclude_db=True) + \
-                      _count_backup_files(MEDIA)
-        
-        if total_items == 0: total_items = 1 
-        current = 0
-
-        # Write zip to a local temp file first, then copy to destination (supports FTP/SMB)
-        temp_zip = str(TEMP / zip_name)
-        TEMP.mkdir(parents=True, exist_ok=True)
-
-        with zipfile.ZipFile(temp_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            
-            def add_folder_to_zip(folder_path, exclude_db=False):
-                nonlocal current
-                for root, dirs, files in os.walk(str(folder_path)):
-                    if folder_path == USERDATA and 'Thumbnails' in dirs: dirs.remove('Thumbnails')
-                    if folder_path == ADDONS and 'packages' in dirs: dirs.remove('packages')
-                    if folder_path == ADDONS and 'temp' in dirs: dirs.remove('temp')
-                    if '.git' in dirs: dirs.remove('.git')
-                    if '__pycache__' in dirs: dirs.remove('__pycache__')
-                    
-                    for file in files:
-                        if exclude_db and file.lower().startswith('textures') and file.lower().endswith('.db'):
+        def _scan_backup_files(folder_path, exclude_db=False):
+            """Collect (path, name, stat) for every file to back up in one scandir pass."""
+            found = []
+            if folder_path == USERDATA:
+                excluded_dirs = USERDATA_EXCLUDE_DIRS
+            elif folder_path == ADDONS:
+                excluded_dirs = ADDONS_EXCLUDE_DIRS
+            else:
+                excluded_dirs = BACKUP_EXCLUDE_DIRS
+            stack = [folder_path]
+            while stack:
+                try:
+                    with os.scandir(stack.pop()) as it:
+                        for entry in it:
+                            name = entry.name
+                            if entry.is_dir(follow_symlinks=False):
+                                if name not in excluded_dirs:
+                                    stack.append(entry.path)
+                                continue
+                            if exclude_db and TEXTURES_DB_RE.match(name):
+                                continue
+                            try:
+                                found.append((entry.path, name, entry.stat()))
+                            except OSError:
+                                pass
+                except OSError:
+                    pass
+            return found
+
+        addons_files = _scan_backup_files(ADDONS)
+        userdata_files = _scan_backup_files(USERDATA, exclude_db=True)
+        media_files = _scan_backup_files(MEDIA)
+
+        # Progress is measured in bytes, taken from the stats gathered above
+        total_bytes = sum(st.st_size for files in (addons_files, userdata_files, media_files)
+                          for _, _, st in files)
+        if total_bytes == 0: total_bytes = 1
+        current_bytes = 0
+
+        # Local destinations are written to a .part file next to the target and
+        # renamed over it once complete, so a cancel or failure never touches an
+        # existing backup. Only VFS URLs (FTP/SMB/NFS) go through TEMP and a copy
+        is_remote = is_vfs_url(dest_path)
+        if is_remote:
+            zip_target = os.path.join(TEMP, zip_name)
+            os.makedirs(TEMP, exist_ok=True)
+        else:
+            zip_target = dest_path + '.part'
+            # Don't read back the files we are writing (backup saved inside media/ etc.)
+            own_paths = {os.path.normcase(os.path.normpath(p)) for p in (dest_path, zip_target)}
+            addons_files, userdata_files, media_files = (
+                [f for f in files if os.path.normcase(f[0]) not in own_paths]
+                for files in (addons_files, userdata_files, media_files))
+
+        with zipfile.ZipFile(zip_target, 'w', zipfile.ZIP_DEFLATED,
+                             compresslevel=ZIP_COMPRESSLEVEL) as zipf, \
+                ThreadPoolExecutor(max_workers=DEFLATE_WORKERS) as pool:
+
+            # Small files are compressed on the pool and written in order;
+            # at most this many are in flight to bound memory use
+            pending = deque()
+            max_pending = DEFLATE_WORKERS * 2
+
+            def _advance(file, size):
+                nonlocal current_bytes
+                current_bytes += size
+                pct = int(current_bytes * 100 / total_bytes)
+                progress.update(pct, f'Backing up: {file}')
+                if progress.iscanceled(): raise KeyboardInterrupt("Cancelled")
+
+            def _drain(keep=0):
+                while len(pending) > keep:
+                    zi, file, size, future = pending.popleft()
+                    try:
+                        write_precompressed(zipf, zi, *future.result())
+                    except Exception: pass
+                    _advance(file, size)
+
+            def add_files_to_zip(files):
+                for full_path, file, st in files:
+                    arcname = get_zip_arcname(full_path, HOME)
+                    try:
+                        zi = zipfile.ZipInfo(arcname, time.localtime(st.st_mtime)[:6])
+                        zi.external_attr = (st.st_mode & 0xFFFF) << 16
+                        zi.file_size = st.st_size
+                        if os.path.splitext(file)[1].lower() in STORED_EXTS:
+                            zi.compress_type = zipfile.ZIP_STORED
+                        elif st.st_size <= PARALLEL_DEFLATE_MAX:
+                            pending.append((zi, file, st.st_size, pool.submit(deflate_file, full_path)))
+                            _drain(keep=max_pending)
                             continue
+                        else:
+                            zi.compress_type = zipfile.ZIP_DEFLATED
+                            # ZipFile.open() doesn't apply the archive level to a caller-built ZipInfo
+                            zi._compresslevel = ZIP_COMPRESSLEVEL
+                        # Large or stored files are streamed; keep archive order
+                        _drain()
+                        with open(full_path, 'rb', buffering=0) as zsrc, \
+                                zipf.open(zi, 'w', force_zip64=True) as zdst:
+                            shutil.copyfileobj(zsrc, zdst, length=COPY_BUFFER_SIZE)
+                    except Exception: pass
+                    _advance(file, st.st_size)
+                _drain()
 
-                        full_path = Path(root) / file
-                        arcname = get_zip_arcname(full_path, HOME)
-                        try:
-                            zipf.write(str(full_path), arcname)
-                        except Exception: pass
-                        current += 1
-                        pct = int(current * 100 / total_items)
-                        progress.update(pct, f'Backing up: {file}')
-                        if progress.iscanceled(): raise KeyboardInterrupt("Cancelled")
-
-            add_folder_to_zip(ADDONS)
-            add_folder_to_zip(USERDATA, exclude_db=True)
+            add_files_to_zip(addons_files)
+            add_files_to_zip(userdata_files)
             
             zi_thumbnails = zipfile.ZipInfo('userdata/Thumbnails/')
             zi_thumbnails.external_attr = 0o40775 << 16 | 0x10
@@ -364,16 +377,21 @@ def backup():
             zi_media = zipfile.ZipInfo('media/') 
             zi_media.external_attr = 0o40775 << 16 | 0x10
             zipf.writestr(zi_media, '')
-            add_folder_to_zip(MEDIA)
+            add_files_to_zip(media_files)
 
-        progress.update(99, 'Copying to destination...')
-        success = vfs_copy_file(temp_zip, dest_path)
-        
-        # Clean up temp file
-        try:
-            os.remove(temp_zip)
-        except Exception:
-            pass
+        success = True
+        if is_remote:
+            progress.update(99, 'Copying to destination...')
+            success = vfs_copy_file(zip_target, dest_path)
+
+            # Clean up temp file
+            try:
+                os.remove(zip_target)
+            except Exception:
+                pass
+        else:
+            # Same folder, so this is a rename rather than a copy
+            os.replace(zip_target, dest_path)
 
         progress.close()
         
@@ -385,19 +403,52 @@ def backup():
     except KeyboardInterrupt:
         progress.close()
         try:
-            os.remove(temp_zip)
+            os.remove(zip_target)
         except Exception:
             pass
         notify('Backup', 'Cancelled by user.')
     except Exception as e:
         if 'progress' in locals(): progress.close()
         try:
-            os.remove(temp_zip)
+            os.remove(zip_target)
         except Exception:
             pass
         log_error('Backup', e)
 
+# Top-level backup folders and where they are restored to
+RESTORE_TARGETS = {
+    'addons':   ADDONS,
+    'userdata': USERDATA,
+    'media':    MEDIA,
+}
+
+def restore_staging_root(target, staging_dir):
+    """
+    Where to extract a backup folder before it replaces target.
+    A '.new' sibling sits on target's filesystem, so the final move is a
+    rename. If target is a mount point of its own, a sibling would be on
+    a different device, so extract into the TEMP staging dir instead.
+    """
+    parent, name = os.path.split(target)
+    try:
+        if os.stat(target).st_dev != os.stat(parent).st_dev:
+            return os.path.join(staging_dir, name)
+    except OSError:
+        pass
+    return target + '.new'
+
+def discard_restore_staging(staging_dir, staging_roots):
+    import shutil
+
+    for folder in (staging_dir, *staging_roots.values()):
+        if os.path.exists(folder):
+            shutil.rmtree(folder, ignore_errors=True)
+
 def restore():
+    import shutil
+    import zipfile
+    import zlib
+
     show_description('Restore', DESCRIPTIONS['Restore'])
     
     while True:
@@ -416,8 +467,8 @@ def restore():
         progress.create('Restore', 'Preparing...')
 
         #Download remote ZIP to local temp via VFS (handles SMB/NFS/FTP)
-        local_zip = str(TEMP / 'restore_temp.zip')
-        TEMP.mkdir(parents=True, exist_ok=True)
+        local_zip = os.path.join(TEMP, 'restore_temp.zip')
+        os.makedirs(TEMP, exist_ok=True)
 
         progress.update(5, 'Downloading backup to temp...')
         if not vfs_download_file(zip_path_str, local_zip):
@@ -425,105 +476,111 @@ def restore():
             xbmcgui.Dialog().ok('Restore Failed', 'Could not read the backup file.\nCheck the path and try again.')
             return
 
-        #Extract to staging directory first so cancel is safe
-        staging_dir = TEMP / 'restore_staging'
-        if staging_dir.exists():
-            shutil.rmtree(str(staging_dir), ignore_errors=True)
-        staging_dir.mkdir(parents=True, exist_ok=True)
+        #Extract to staging directories first so cancel is safe
+        staging_dir = os.path.join(TEMP, 'restore_staging')
+        staging_roots = {name: restore_staging_root(target, staging_dir)
+                         for name, target in RESTORE_TARGETS.items()}
+        discard_restore_staging(staging_dir, staging_roots)
+        os.makedirs(staging_dir, exist_ok=True)
 
         progress.update(10, 'Extracting backup (please wait)...')
 
         with zipfile.ZipFile(local_zip, 'r') as zipf:
-            progress.update(10, 'Verifying backup integrity...')
-            bad_file = zipf.testzip()
-            if bad_file is not None:
-                progress.close()
-                shutil.rmtree(str(staging_dir), ignore_errors=True)
-                try: os.remove(local_zip)
-                except Exception: pass
-                xbmcgui.Dialog().ok(
-                    'Restore Cancelled',
-                    '[COLOR red][B]Backup is corrupted![/B][/COLOR]\n\n'
-                    f'Failed integrity check on:\n[B]{bad_file}[/B]\n\n'
-                    'Restore has been cancelled. No changes were made.')
-                return
-
             members = zipf.namelist()
             total = len(members)
+            bad_file = None
+            # Talk to the GUI at most ~200 times instead of once per member
+            update_every = max(1, total // 200)
             for idx, member in enumerate(members):
-                if progress.iscanceled():
-                    progress.close()
-                    shutil.rmtree(str(staging_dir), ignore_errors=True)
-                    try: os.remove(local_zip)
-                    except Exception: pass
-                    notify('Restore', 'Cancelled. No changes were made.')
-                    return
+                if idx % update_every == 0:
+                    if progress.iscanceled():
+                        progress.close()
+                        discard_restore_staging(staging_dir, staging_roots)
+                        try: os.remove(local_zip)
+                        except Exception: pass
+                        notify('Restore', 'Cancelled. No changes were made.')
+                        return
+                    progress.update(10 + int((idx / total) * 60), f'Extracting: {member}')
 
-                if member.startswith('media/'):
-                    target_path = staging_dir / 'media' / member[6:]
+                top, _, rest = member.partition('/')
+                if top in staging_roots:
+                    target_path = os.path.join(staging_roots[top], rest)
                 else:
-                    target_path = staging_dir / member
+                    target_path = os.path.join(staging_dir, member)
 
                 try:
                     if member.endswith('/'):
-                        target_path.mkdir(parents=True, exist_ok=True)
+                        os.makedirs(target_path, exist_ok=True)
                     else:
-                        target_path.parent.mkdir(parents=True, exist_ok=True)
-                        with zipf.open(member) as s, open(str(target_path), 'wb') as d:
-                            shutil.copyfileobj(s, d)
+                        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                        with zipf.open(member) as s, open(target_path, 'wb') as d:
+                            shutil.copyfileobj(s, d, length=COPY_BUFFER_SIZE)
+                except (zipfile.BadZipFile, zlib.error, EOFError):
+                    # ZipExtFile checks the CRC as it reads, so extracting doubles as the integrity check
+                    bad_file = member
+                    break
                 except Exception: pass
-                progress.update(10 + int((idx / total) * 60), f'Extracting: {member}')
+
+        if bad_file is not None:
+            progress.close()
+            discard_restore_staging(staging_dir, staging_roots)
+            try: os.remove(local_zip)
+            except Exception: pass
+            xbmcgui.Dialog().ok(
+                'Restore Cancelled',
+                '[COLOR red][B]Backup is corrupted![/B][/COLOR]\n\n'
+                f'Failed integrity check on:\n[B]{bad_file}[/B]\n\n'
+                'Restore has been cancelled. No changes were made.')
+            return
 
         # Extraction complete — now wipe and move
         progress.update(75, 'Applying restore (do NOT interrupt)...')
 
-        folders_to_wipe = [ADDONS, USERDATA, MEDIA]
-        for i, folder in enumerate(folders_to_wipe):
-            progress.update(75 + int(i * 5), f'Wiping: {folder.name}')
+        for i, folder in enumerate(RESTORE_TARGETS.values()):
+            progress.update(75 + int(i * 5), f'Wiping: {os.path.basename(folder)}')
             safe_wipe_folder(folder)
 
         progress.update(90, 'Moving restored files into place...')
 
-        # Map staging folder names to their real destinations
-        staging_map = {
-            'addons':   ADDONS,
-            'userdata': USERDATA,
-            'media':    MEDIA,
-        }
-
         move_errors = []
 
         def _safe_move(src, dst):
             """Move src to dst, removing any existing dst first to avoid
             shutil.move's 'move-into' behaviour when dst already exists."""
             try:
-                if dst.exists():
-                    if dst.is_dir():
-                        shutil.rmtree(str(dst))
-                    else:
-                        dst.unlink()
-                shutil.move(str(src), str(dst))
+                if os.path.isdir(dst):
+                    shutil.rmtree(dst)
+                elif os.path.lexists(dst):
+                    os.remove(dst)
+                shutil.move(src, dst)
             except Exception as ex:
-                err = f'{src.name}: {ex}'
+                err = f'{os.path.basename(src)}: {ex}'
                 move_errors.append(err)
                 xbmc.log(f'LazyMaintenance: Move failed {src} -> {dst}: {ex}', xbmc.LOGERROR)
 
-        for item in staging_dir.iterdir():
-            target_root = staging_map.get(item.name)
-            if target_root is None:
-                # Unknown top-level item — move it directly under HOME
-                target_root = HOME
-                _safe_move(item, HOME / item.name)
+        for name, target_root in RESTORE_TARGETS.items():
+            staged = staging_roots[name]
+            if not os.path.isdir(staged):
                 continue
-
-            if item.is_dir():
-                target_root.mkdir(parents=True, exist_ok=True)
-                for sub in item.iterdir():
-                    _safe_move(sub, target_root / sub.name)
-            else:
-                _safe_move(item, target_root / item.name)
-
-        shutil.rmtree(str(staging_dir), ignore_errors=True)
+            try:
+                # Wiped folder is empty unless something was locked; then a
+                # single rename commits the whole tree without copying a byte
+                if os.path.exists(target_root):
+                    os.rmdir(target_root)
+                os.rename(staged, target_root)
+                continue
+            except OSError as ex:
+                xbmc.log(f'LazyMaintenance: Moving {name} item by item: {ex}', xbmc.LOGDEBUG)
+            os.makedirs(target_root, exist_ok=True)
+            for sub in os.listdir(staged):
+                _safe_move(os.path.join(staged, sub), os.path.join(target_root, sub))
+
+        for item in os.listdir(staging_dir):
+            if item in RESTORE_TARGETS: continue
+            # Unknown top-level item — move it directly under HOME
+            _safe_move(os.path.join(staging_dir, item), os.path.join(HOME, item))
+
+        discard_restore_staging(staging_dir, staging_roots)
         try: os.remove(local_zip)
         except Exception: pass
 
@@ -545,10 +602,10 @@ def restore():
         force_close_kodi()
 
     except Exception as e:
-        staging_dir = TEMP / 'restore_staging'
-        if staging_dir.exists():
-            shutil.rmtree(str(staging_dir), ignore_errors=True)
-        try: os.remove(str(TEMP / 'restore_temp.zip'))
+        staging_dir = os.path.join(TEMP, 'restore_staging')
+        discard_restore_staging(staging_dir, {name: restore_staging_root(target, staging_dir)
+                                              for name, target in RESTORE_TARGETS.items()})
+        try: os.remove(os.path.join(TEMP, 'restore_temp.zip'))
         except Exception: pass
         if 'progress' in locals(): progress.close()
         log_error('Restore', e)
@@ -565,11 +622,11 @@ def reset_kodi():
         progress.create('Fresh Start', 'Wiping data...')
 
         progress.update(10, "Scanning Userdata...")
-        if USERDATA.exists():
+        if os.path.exists(USERDATA):
             safe_wipe_folder(USERDATA)
 
         progress.update(50, "Scanning Addons...")
-        if ADDONS.exists():
+        if os.path.exists(ADDONS):
             safe_wipe_folder(ADDONS, exclude_list=[ADDON_ID])
 
         progress.update(100, "Complete!")
@@ -589,8 +646,11 @@ def reset_kodi():
         xbmcgui.Dialog().ok('Error', f'Fresh Start failed:\n{e}')
 
 def upload_log():
-    log_file = LOGPATH / 'kodi.log'
-    if not log_file.exists():
+    import json
+    import urllib.request
+
+    log_file = os.path.join(LOGPATH, 'kodi.log')
+    if not os.path.exists(log_file):
         notify('Error', 'No log file found.')
         return
 
@@ -598,17 +658,33 @@ def upload_log():
         return
 
     try:
-        addon_version = ADDON.getAddonInfo('version')
+        addon_version = get_addon().getAddonInfo('version')
         user_agent_string = f'Kodi-LazyMaintenance/{addon_version}'
-        with open(str(log_file), 'rb') as f: log_data = f.read()
 
-        req = urllib.request.Request(
-            'https://paste.kodi.tv/documents', 
-            data=log_data,
-            headers={'User-Agent': user_agent_string}
-        )
-        with urllib.request.urlopen(req) as response:
-            result = json.loads(response.read().decode('utf-8'))
+        def _read_upto(f, size, block=64 * 1024):
+            """Yield at most size bytes of f; Kodi keeps appending while we send."""
+            while size > 0:
+                chunk = f.read(min(block, size))
+                if not chunk:
+                    break
+                size -= len(chunk)
+                yield chunk
+
+        # Stream the open file instead of reading the whole log into memory;
+        # an explicit Content-Length keeps urllib from switching to chunked,
+        # and the body stops at that snapshot even if the log grows meanwhile
+        with open(log_file, 'rb') as log_data:
+            log_size = os.fstat(log_data.fileno()).st_size
+            req = urllib.request.Request(
+                'https://paste.kodi.tv/documents', 
+                data=_read_upto(log_data, log_size),
+                headers={
+                    'User-Agent': user_agent_string,
+                    'Content-Length': str(log_size),
+                }
+            )
+            with urllib.request.urlopen(req) as response:
+                result = json.loads(response.read().decode('utf-8'))
         
         if 'key' in result:
             url = f"https://paste.kodi.tv/{result['key']}"
@@ -619,26 +695,34 @@ def upload_log():
         log_error('Log Upload', e)
 
 def read_log():
-    log_file = LOGPATH / 'kodi.log'
-    if not log_file.exists():
+    log_file = os.path.join(LOGPATH, 'kodi.log')
+    if not os.path.exists(log_file):
         notify('Error', 'No log file found.')
         return
     try:
-        with open(str(log_file), 'r', encoding='utf-8', errors='ignore') as f:
-            xbmcgui.Dialog().textviewer('Kodi Log', f.read())
+        title = 'Kodi Log'
+        with open(log_file, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size > LOG_TAIL_SIZE and get_addon().getSetting('read_full_log') != 'true':
+                # Only the end of a huge log is useful and textviewer chokes on the rest
+                f.seek(-LOG_TAIL_SIZE, os.SEEK_END)
+                f.readline()  # Drop the partial first line
+                title = f'Kodi Log (last {LOG_TAIL_SIZE // 1024} KB)'
+            data = f.read().decode('utf-8', errors='ignore')
+        xbmcgui.Dialog().textviewer(title, data)
     except Exception as e:
         log_error('Read Log', e)
 
 def export_log():
-    log_file = LOGPATH / 'kodi.log'
-    if not log_file.exists():
+    log_file = os.path.join(LOGPATH, 'kodi.log')
+    if not os.path.exists(log_file):
         notify('Error', 'No log file found.')
         return
     dest = xbmcgui.Dialog().browse(0, 'Select Export Location', 'files')
     if dest:
         try:
             dest_path = dest + 'kodi.log' if dest.endswith('/') or dest.endswith('\\') else dest + '/kodi.log'
-            if vfs_copy_file(str(log_file), dest_path):
+            if vfs_copy_file(log_file, dest_path):
                 notify('Success', 'Log exported.')
             else:
                 notify('Error', 'Failed to export log.')
@@ -646,10 +730,10 @@ def export_log():
             log_error('Export Log', e)
 
 def clear_log():
-    log_file = LOGPATH / 'kodi.log'
-    if not log_file.exists(): return
+    log_file = os.path.join(LOGPATH, 'kodi.log')
+    if not os.path.exists(log_file): return
     try:
-        open(str(log_file), 'w').close()
+        open(log_file, 'w').close()
         notify('Success', 'Log cleared.')
         reload_ui(silent=True)
     except Exception as e: 
@@ -720,46 +804,35 @@ def refresh_menu():
     xbmcplugin.addSortMethod(handle, xbmcplugin.SORT_METHOD_UNSORTED)
     xbmcplugin.endOfDirectory(handle)
 
-def router():
-    params = dict(urllib.parse.parse_qsl(sys.argv[2][1:]))
-    mode = params.get('mode')
-
-    if mode is None:
-        main_menu()
-    elif mode == 'backup_menu':
-        backup_menu()
-    elif mode == 'log_menu':
-        log_menu()
-    elif mode == 'refresh_menu':
-        refresh_menu()
-    
+ROUTES = {
+    None:            main_menu,
+    'backup_menu':   backup_menu,
+    'log_menu':      log_menu,
+    'refresh_menu':  refresh_menu,
+
     # Actions
-    elif mode == 'hard_clean':
-        hard_clean()
-    elif mode == 'fresh_start':
-        reset_kodi()
-    elif mode == 'backup':
-        backup()
-    elif mode == 'restore':
-        restore()
-    elif mode == 'settings':
-        open_settings()
-    
+    'hard_clean':    hard_clean,
+    'fresh_start':   reset_kodi,
+    'backup':        backup,
+    'restore':       restore,
+    'settings':      open_settings,
+
     # Log Actions (Plugin logic automatically keeps you in the menu after these run)
-    elif mode == 'read_log':
-        read_log()
-    elif mode == 'export_log':
-        export_log()
-    elif mode == 'upload_log':
-        upload_log()
-    elif mode == 'clear_log':
-        clear_log()
-        
+    'read_log':      read_log,
+    'export_log':    export_log,
+    'upload_log':    upload_log,
+    'clear_log':     clear_log,
+
     # Refresh Actions
-    elif mode == 'refresh_repos':
-        refresh_repos()
-    elif mode == 'refresh_ui':
-        reload_ui()
+    'refresh_repos': refresh_repos,
+    'refresh_ui':    reload_ui,
+}
+
+def router():
+    params = dict(urllib.parse.parse_qsl(sys.argv[2][1:]))
+    action = ROUTES.get(params.get('mode'))
+    if action is not None:
+        action()
 
 if __name__ == '__main__':
     router()
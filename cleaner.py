@@ -0,0 +1,144 @@
+import xbmc
+import xbmcgui
+import os
+
+import constants
+
+WIPE_WORKERS = 8  # Parallel deletes in safe_wipe_folder, lower for weak devices
+
+# --- Helper Functions ---
+
+def notify(title, message, duration=5000):
+    xbmcgui.Dialog().notification(title, message, time=duration)
+
+def log_error(context, exception):
+    """Centralized error handling."""
+    msg = f"LazyMaintenance Error [{context}]: {str(exception)}"
+    xbmc.log(msg, xbmc.LOGERROR)
+    if not context.startswith("Auto"):
+        notify('Lazy Maintenance Error', f'{context}: {str(exception)}')
+
+def safe_delete_item(entry):
+    """
+    Tries to delete a file or folder from an os.scandir() entry.
+    If locked (Windows/Kodi in use), it skips it without crashing.
+    """
+    import shutil
+
+    try:
+        # The dirent type bit answers is_dir() without another stat
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path, ignore_errors=True)
+        else:
+            os.unlink(entry.path)
+    except Exception:
+        # File is likely locked by the OS, skip it
+        xbmc.log(f"LazyMaintenance: Skipped locked file {entry.name}", xbmc.LOGDEBUG)
+        pass
+
+def safe_wipe_folder(folder_path, exclude_list=None):
+    """
+    Deletes the top-level items of a folder in parallel on WIPE_WORKERS threads.
+    A locked item is skipped without stopping the rest.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if exclude_list is None:
+        exclude_list = []
+    if not os.path.exists(folder_path): return
+
+    with os.scandir(folder_path) as it:
+        items = [entry for entry in it if entry.name not in exclude_list]
+    # Overlap the per-item rmtree syscall latency across a small pool
+    with ThreadPoolExecutor(max_workers=WIPE_WORKERS) as executor:
+        list(executor.map(safe_delete_item, items))
+
+# --- Core Logic ---
+
+def _scan_files(root):
+    """Yields (mtime, size, path) for every file below root in a single os.scandir pass."""
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    try:
+                        stat = entry.stat(follow_symlinks=False)
+                    except OSError as e:
+                        xbmc.log(f"Error reading file stats {entry.path}: {e}", xbmc.LOGDEBUG)
+                        continue
+                    yield stat.st_mtime, stat.st_size, entry.path
+        except OSError:
+            pass
+
+def trim_folder(path_obj, max_size_mb):
+    """Trims folder to target size in MB."""
+    if not os.path.exists(path_obj):
+        return
+
+    max_size_bytes = max_size_mb * 1024 * 1024
+    root = path_obj
+    current_size = 0
+    file_list = []
+    for mtime, size, fp in _scan_files(root):
+        current_size += size
+        if os.path.basename(fp) == 'kodi.log': continue
+        file_list.append((mtime, size, fp))
+
+    if current_size <= max_size_bytes:
+        return
+
+    file_list.sort(key=lambda x: x[0])
+
+    touched_dirs = set()
+    for mtime, size, fp in file_list:
+        try:
+            os.unlink(fp)
+            touched_dirs.add(os.path.dirname(fp))
+            current_size -= size
+            if current_size <= max_size_bytes:
+                break
+        except Exception:
+            pass
+
+    # Only folders that lost a file can have become empty. Deepest first,
+    # climbing to the parent while rmdir keeps succeeding.
+    for dp in sorted(touched_dirs, key=len, reverse=True):
+        while dp != root and dp.startswith(root):
+            try:
+                os.rmdir(dp)
+            except OSError:
+                break
+            dp = os.path.dirname(dp)
+
+def clear_folder(path_obj):
+    if not os.path.exists(path_obj): return
+    # Use the robust safe wipe function
+    safe_wipe_folder(path_obj, exclude_list=['kodi.log'])
+
+def clean(silent=False):
+    """Auto clean on startup"""
+    try:
+        try:
+            auto_limit = int(constants.get_addon().getSetting('auto_clean_size'))
+        except (ValueError, TypeError):
+            auto_limit = 50
+
+        # Paths are looked up here rather than at import, so nothing is
+        # translated unless a clean actually runs
+        clear_folder(constants.TEMP)
+        clear_folder(constants.PACKAGES)
+        if auto_limit > 0:
+            trim_folder(constants.THUMBNAILS, auto_limit)
+
+        if silent:
+            msg = 'Auto clean done.'
+        else:
+            msg = 'Cleaning completed.'
+        notify('Lazy Maintenance', msg)
+
+    except Exception as e:
+        log_error('Auto Cleaning', e)
@@ -1,82 +1,75 @@
-import xbmcaddon
+import os
 import xbmcvfs
-from pathlib import Path
+from collections import namedtuple
+from functools import lru_cache
 
 ADDON_ID = 'plugin.program.lazymaintenance'
-ADDON = xbmcaddon.Addon(ADDON_ID)
 
-# Helper for Kodi Paths using pathlib
+@lru_cache(maxsize=None)
+def get_addon():
+    """The xbmcaddon.Addon for this add-on, created on first use."""
+    import xbmcaddon
+
+    return xbmcaddon.Addon(ADDON_ID)
+
+# translatePath crosses into Kodi; the set of special:// roots is small and fixed.
+# Wrapping the C function directly skips a Python frame and the attribute lookup
+_translate = lru_cache(maxsize=None)(xbmcvfs.translatePath)
+
+# Helper for Kodi Paths - plain strings, since os/shutil/zipfile all take them
 def get_kodi_path(path_str):
-    return Path(xbmcvfs.translatePath(path_str))
+    """
+    Translated, normalised native path for a special:// URL, as a str.
+    Anything else is taken to be a real path already and returned as is.
+    """
+    if not path_str.startswith('special://'):
+        return path_str
+    return os.path.normpath(_translate(path_str))
+
+# Paths - resolved on first access by __getattr__ below. Parents come before
+# their children, so a child is joined onto its resolved parent rather than
+# sent through translatePath again.
+_SPECIAL = {
+    'HOME': 'special://home',
+    'USERDATA': 'special://userdata',
+    'TEMP': 'special://temp',
+    'THUMBNAILS': 'special://thumbnails',
+    'LOGPATH': 'special://logpath',
+    'ADDONS': 'special://home/addons',
+    'PACKAGES': 'special://home/addons/packages',
+    'MEDIA': 'special://home/media',
+    'DATABASE': 'special://userdata/Database',
+}
+
+# Immutable bundle of every path above, as plain strings
+_KodiPaths = namedtuple('_KodiPaths', _SPECIAL)
+
+@lru_cache(maxsize=None)
+def _paths():
+    """Resolve the whole _SPECIAL table in one pass, the first time any path is needed."""
+    resolved = {}
+    for special in _SPECIAL.values():
+        parent, _, child = special.rpartition('/')
+        if parent in resolved:
+            resolved[special] = os.path.join(resolved[parent], child)
+        else:
+            resolved[special] = get_kodi_path(special)
+    return _KodiPaths(*map(resolved.__getitem__, _SPECIAL.values()))
 
-# Paths
-HOME = get_kodi_path('special://home/')
-ADDONS = get_kodi_path('special://home/addons/')
-USERDATA = get_kodi_path('special://userdata/')
-TEMP = get_kodi_path('special://temp/')
-THUMBNAILS = get_kodi_path('special://thumbnails/')
-PACKAGES = get_kodi_path('special://home/addons/packages/')
-LOGPATH = get_kodi_path('special://logpath/')
-MEDIA = get_kodi_path('special://home/media/')
-DATABASE = get_kodi_path('special://userdata/Database/')
+def __getattr__(name):
+    """
+    Module-level lazy attributes (PEP 562): ADDON and the paths above are
+    only built when something asks for them. The result is stored in the
+    module globals, so later lookups never come back here.
+    """
+    if name == 'ADDON':
+        value = get_addon()
+    elif name in _KodiPaths._fields:
+        value = getattr(_paths(), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
 
-DESCRIPTIONS = {
-    'Hard Clean': (
-        "[COLOR red][B]WARNING: This is destructive![/B][/COLOR]\n\n"
-        "Completely clears:\n"
-        "• Temp/Cache folder\n"
-        "• Thumbnails folder\n"
-        "• Packages folder\n\n"
-        "Also deletes Textures13.db (texture cache database).\n\n"
-        "Kodi will force close to properly rebuild textures."
-    ),
-    
-    'Refresh Options': (
-        "Refresh repositories or reload the user interface.\n\n"
-        "• Refresh Repos: Manually scan for addon updates\n"
-        "• Refresh UI: Reload skin to fix display glitches"
-    ),
-    
-    'Backup/Restore': (
-        "Create a complete backup of your Kodi configuration\n"
-        "or restore from a previous backup.\n\n"
-        "Safe way to save and recover your setup."
-    ),
-    
-    'Backup': (
-        "Creates a ZIP backup containing:\n\n"
-        "• All installed addons\n"
-        "• Userdata (settings, databases, favorites, etc.)\n"
-        "• Media folder contents\n\n"
-        "Excludes large cache folders (Thumbnails, Packages, Temp\n"
-        "and Textures13.db) to keep the backup size manageable."
-    ),
-    
-    'Restore': (
-        "[COLOR red][B]DANGER: This overwrites your current setup![/B][/COLOR]\n\n"
-        "Process:\n"
-        "1. Select your backup ZIP file\n"
-        "2. Current addons, settings and data are wiped\n"
-        "3. Backup contents are restored\n"
-        "4. Kodi force closes to apply changes\n\n"
-        "[I]Note: The screen may go black during extraction –\n"
-        "please be patient and wait for completion.[/I]"
-    ),
-    
-    'Log Options': (
-        "Manage the Kodi log file:\n\n"
-        "• Read: View the current log\n"
-        "• Export: Save log to another location\n"
-        "• Upload: Share log via public paste service\n"
-        "• Clear: Empty the log file"
-    ),
-    
-    'Fresh Start': (
-        "[COLOR red][B]WARNING: Total reset![/B][/COLOR]\n\n"
-        "Deletes:\n"
-        "• Entire userdata folder\n"
-        "• All addons except this maintenance tool\n\n"
-        "Results in a fresh Kodi installation.\n\n"
-        "Kodi will force close afterwards."
-    )
-}
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(_KodiPaths._fields) | {'ADDON'})
@@ -0,0 +1,74 @@
+import sys
+from types import MappingProxyType
+
+# Help text for the plugin menus. Kept out of constants so the startup
+# service never loads it.
+
+# Markup shared by the descriptions below
+_WARN_OPEN = '[COLOR red][B]'
+_WARN_CLOSE = '[/B][/COLOR]'
+_BULLET = '• '
+
+_DESCRIPTIONS_RAW = (
+    ('Hard Clean', (
+        f"{_WARN_OPEN}WARNING: This is destructive!{_WARN_CLOSE}\n\n"
+        "Completely clears:\n"
+        f"{_BULLET}Temp/Cache folder\n"
+        f"{_BULLET}Thumbnails folder\n"
+        f"{_BULLET}Packages folder\n\n"
+        "Also deletes Textures13.db (texture cache database).\n\n"
+        "Kodi will force close to properly rebuild textures."
+    )),
+    
+    ('Refresh Options', (
+        "Refresh repositories or reload the user interface.\n\n"
+        f"{_BULLET}Refresh Repos: Manually scan for addon updates\n"
+        f"{_BULLET}Refresh UI: Reload skin to fix display glitches"
+    )),
+    
+    ('Backup/Restore', (
+        "Create a complete backup of your Kodi configuration\n"
+        "or restore from a previous backup.\n\n"
+        "Safe way to save and recover your setup."
+    )),
+    
+    ('Backup', (
+        "Creates a ZIP backup containing:\n\n"
+        f"{_BULLET}All installed addons\n"
+        f"{_BULLET}Userdata (settings, databases, favorites, etc.)\n"
+        f"{_BULLET}Media folder contents\n\n"
+        "Excludes large cache folders (Thumbnails, Packages, Temp\n"
+        "and Textures13.db) to keep the backup size manageable."
+    )),
+    
+    ('Restore', (
+        f"{_WARN_OPEN}DANGER: This overwrites your current setup!{_WARN_CLOSE}\n\n"
+        "Process:\n"
+        "1. Select your backup ZIP file\n"
+        "2. Current addons, settings and data are wiped\n"
+        "3. Backup contents are restored\n"
+        "4. Kodi force closes to apply changes\n\n"
+        "[I]Note: The screen may go black during extraction –\n"
+        "please be patient and wait for completion.[/I]"
+    )),
+    
+    ('Log Options', (
+        "Manage the Kodi log file:\n\n"
+        f"{_BULLET}Read: View the current log\n"
+        f"{_BULLET}Export: Save log to another location\n"
+        f"{_BULLET}Upload: Share log via public paste service\n"
+        f"{_BULLET}Clear: Empty the log file"
+    )),
+    
+    ('Fresh Start', (
+        f"{_WARN_OPEN}WARNING: Total reset!{_WARN_CLOSE}\n\n"
+        "Deletes:\n"
+        f"{_BULLET}Entire userdata folder\n"
+        f"{_BULLET}All addons except this maintenance tool\n\n"
+        "Results in a fresh Kodi installation.\n\n"
+        "Kodi will force close afterwards."
+    )),
+)
+
+# Read-only view; interned so every UI render shares the same string objects
+DESCRIPTIONS = MappingProxyType({k: sys.intern(v) for k, v in _DESCRIPTIONS_RAW})
\ No newline at end of file
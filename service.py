@@ -1,8 +1,23 @@
-import xbmc
+STARTUP_TIMEOUT = 15  # seconds
+POLL_INTERVAL = 0.5
 
-# Wait for Kodi to fully initialize before running auto clean
-monitor = xbmc.Monitor()
+def _main():
+    import xbmc
 
-if not monitor.waitForAbort(5):
-    import addon
-    addon.clean(silent=True)
+    # Wait for Kodi to fully initialize before running auto clean. Polling lets
+    # a fast startup go ahead as soon as the home window is up, gives slow ones
+    # up to STARTUP_TIMEOUT, and returns at once if Kodi is shutting down.
+    # Everything lives in this function so the monitor is freed once we're done.
+    monitor = xbmc.Monitor()
+    for _ in range(int(STARTUP_TIMEOUT / POLL_INTERVAL)):
+        if monitor.waitForAbort(POLL_INTERVAL):
+            return
+        if xbmc.getCondVisibility('Window.IsVisible(home)'):
+            break
+
+    # Only the cleaning helpers are needed here, not the whole plugin UI
+    from cleaner import clean
+    clean(silent=True)
+
+_main()
+del _main